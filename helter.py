@@ -7,6 +7,23 @@ if __name__ == "__main__":
   if len(sys.argv) == 1:
     import repl
     repl.repl()
+  elif sys.argv[1] == '--watch':
+    import incremental
+    try:
+      incremental.watch(sys.argv[2])
+    except KeyboardInterrupt:
+      pass
+  elif sys.argv[1] == '--memstats':
+    import memstats
+    with open(sys.argv[2]) as f:
+      result, stats = memstats.evaluate(f.read())
+    if result is None:
+      print('Invalid syntax', file=sys.stderr)
+    elif len(sys.argv) > 3:
+      with open(sys.argv[3], 'w') as f:
+        f.write(stats.to_json(indent=2))
+    else:
+      print(stats, file=sys.stderr)
   else:
     with open(sys.argv[1]) as f:
       p = parse.parse(f.read())
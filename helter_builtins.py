@@ -158,11 +158,13 @@ class CyclicImportError(Exception):
     pass
 
 IMPORTS_IN_PROGRESS = set()
+IMPORTED_FILES = []
 def helter_import(x):
     if type_check(x, 'string'):
         filename = x.content
         if filename in IMPORTS_IN_PROGRESS:
             raise CyclicImportError(filename)
+        IMPORTED_FILES.append(filename)
         try:
             f = open(filename)
             parsed = parse.parse(f.read())
@@ -0,0 +1,122 @@
+import os
+import sys
+import time
+import parse
+import logic
+import helter_builtins
+
+MISSING = object()
+
+def first_difference(a, b):
+    n = min(len(a), len(b))
+    for i in range(n):
+        if a[i] != b[i]:
+            return i
+    return n
+
+def mtime(filename):
+    try:
+        return os.stat(filename).st_mtime_ns
+    except OSError:
+        return None
+
+def binds(link):
+    return isinstance(link, logic.Link) and link.close_brace is logic.Square
+
+class IncrementalProgram:
+    def __init__(self, init_value=None, scope=None):
+        self.init_value = init_value or logic.HNONE
+        # all top-level bindings go into this one scope; each binding link
+        # records the entries it overwrote so that it can be rolled back
+        self.scope = logic.Scope(scope or logic.Scope(helter_builtins.BUILTINS))
+        self.source = None
+        self.links = []
+        self.values = []
+        self.undo = []
+        self.imports = []
+        self.result = None
+        self.reused = 0
+    def stale_link(self):
+        for i, imports in enumerate(self.imports):
+            if any(mtime(f) != t for f, t in imports.items()):
+                return i
+        return None
+    def update(self, source):
+        stale = self.stale_link()
+        if source == self.source and self.result is not None and stale is None:
+            return self.result
+        diff = first_difference(self.source or '', source)
+        # a link is only reusable if the edit starts strictly after it, since
+        # text appended directly to its end may extend the link itself, and
+        # if none of the files it imported have changed since
+        limit = len(self.values) if stale is None else stale
+        kept = 0
+        while kept < limit and self.links[kept].end < diff:
+            kept += 1
+        resume = self.links[kept-1].end if kept else 0
+        new_links = parse.parse_links(source, resume)
+        self.rollback(kept)
+        self.links = self.links[:kept] + new_links
+        self.reused = kept
+        self.result = None
+        if self.links:
+            try:
+                self.result = self.evaluate_from(kept)
+            except Exception:
+                # keep only the prefix shared with the previous source, so that
+                # the next update re-evaluates everything after it
+                self.rollback(kept)
+                self.links = self.links[:kept]
+                raise
+        self.source = source
+        return self.result
+    def rollback(self, kept):
+        for undo in reversed(self.undo[kept:]):
+            for k, v in undo.items():
+                if v is MISSING:
+                    self.scope.pop(k, None)
+                else:
+                    self.scope[k] = v
+        del self.undo[kept:]
+        del self.values[kept:]
+        del self.imports[kept:]
+    def evaluate_from(self, i):
+        chain = logic.Chain([link.expr for link in self.links])
+        curr = self.values[i-1] if i else self.init_value
+        return chain.evaluate_from(i, curr, self.scope, mutate_scope=True, evaluate_link=self.evaluate_link)
+    def evaluate_link(self, i, link, inputs, scope):
+        undo = {}
+        if binds(link):
+            for term in link.terms:
+                undo[term.out_key] = dict.get(scope, term.out_key, MISSING)
+        self.undo.append(undo)
+        n = len(helter_builtins.IMPORTED_FILES)
+        value = logic.evaluate_link(i, link, inputs, scope)
+        self.values.append(value)
+        self.imports.append({f: mtime(f) for f in helter_builtins.IMPORTED_FILES[n:]})
+        del helter_builtins.IMPORTED_FILES[n:]
+        return value
+
+def watch(filename, interval=0.5):
+    program = IncrementalProgram()
+    source = None
+    attempted = None
+    last_mtime = None
+    while True:
+        new_mtime = mtime(filename)
+        if new_mtime is not None and new_mtime != last_mtime:
+            last_mtime = new_mtime
+            with open(filename) as f:
+                source = f.read()
+        if source is not None and (source != attempted or program.stale_link() is not None):
+            attempted = source
+            try:
+                result = program.update(source)
+            except Exception as e:
+                print('%s: %s' % (type(e).__name__, e), file=sys.stderr)
+            else:
+                if result is None:
+                    print('Invalid syntax', file=sys.stderr)
+                else:
+                    print(result)
+        time.sleep(interval)
@@ -141,6 +141,9 @@ class Identity(Expression):
         return ''
 IDENTITY = Identity()
 
+def evaluate_link(i, link, inputs, scope):
+    return link.evaluate(inputs, scope, mutate_scope=True)
+
 class Chain(Expression):
     def __init__(self, links):
         self.links = links
@@ -155,6 +158,18 @@ class Chain(Expression):
                     scope = Scope(scope)
             curr = link.evaluate(curr, scope, mutate_scope=True)
         return curr
+    def evaluate_from(self, start, inputs, init_scope, mutate_scope=False, evaluate_link=evaluate_link):
+        curr = inputs
+        scope = init_scope
+        for i in range(start, len(self.links)):
+            link = self.links[i]
+            if isinstance(link, Link):
+                if link.open_brace is Square:
+                    return FloatingChain(Chain([Link(Paren, link.close_brace, link.terms)]+self.links[i+1:]), scope)
+                if link.close_brace is Square and scope is init_scope and not mutate_scope:
+                    scope = Scope(scope)
+            curr = evaluate_link(i, link, curr, scope)
+        return curr
     def __str__(self):
         return ' '.join(map(str, self.links))
     def subst(self, init_scope):
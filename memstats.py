@@ -0,0 +1,156 @@
+import gc
+import json
+import os
+import tracemalloc
+import logic
+import helter_builtins
+import parse
+
+VALUE_CLASSES = [logic.Value, logic.Boxed, logic.Symbol, logic.Struct, logic.FloatingChain]
+SCOPE_CLASSES = [logic.Scope, logic.Protect, logic.Shadow]
+EXPRESSION_CLASSES = [logic.Chain, logic.Link, logic.IndexedTerm, logic.Constant, logic.Reference]
+COUNTED_CLASSES = VALUE_CLASSES + SCOPE_CLASSES + EXPRESSION_CLASSES
+
+NAME_WIDTH = max(len(cls.__name__) for cls in COUNTED_CLASSES)
+
+INTERPRETER_FILES = [os.path.abspath(logic.__file__), os.path.abspath(helter_builtins.__file__)]
+# allocations made by the instrumentation itself, such as the counters
+TOOL_FILES = [os.path.abspath(__file__)]
+
+def file_bytes(snapshot):
+    return {os.path.abspath(stat.traceback[0].filename): stat.size
+            for stat in snapshot.statistics('filename')}
+
+def traced_bytes(sizes, files):
+    return sum(sizes.get(f, 0) for f in files)
+
+class LinkStats:
+    def __init__(self, source, line, column):
+        self.source = source
+        self.line = line
+        self.column = column
+        self.allocations = {}
+        self.peak_live = {}
+        self.bytes = 0
+        self.peak_bytes = 0
+    def classes(self):
+        return sorted(self.allocations)
+    def to_dict(self):
+        return {
+            'source': self.source,
+            'line': self.line,
+            'column': self.column,
+            'allocations': {name: self.allocations[name] for name in self.classes()},
+            'peak_live': {name: self.peak_live[name] for name in self.classes()},
+            'bytes': self.bytes,
+            'peak_bytes': self.peak_bytes
+        }
+    def __str__(self):
+        lines = ['%d:%d %s' % (self.line, self.column, self.source)]
+        for name in self.classes():
+            lines.append('  %-*s %8d allocated %8d peak live' % (
+                NAME_WIDTH, name, self.allocations[name], self.peak_live[name]))
+        lines.append('  %-*s %8d bytes     %8d peak bytes' % (NAME_WIDTH, '', self.bytes, self.peak_bytes))
+        return '\n'.join(lines)
+
+class MemStats:
+    def __init__(self):
+        self.links = []
+        self.live = {}
+        self.current = None
+        self.originals = {}
+    def record(self, obj):
+        name = type(obj).__name__
+        self.live[name] = self.live.get(name, 0) + 1
+        if self.current is not None:
+            self.current.allocations[name] = self.current.allocations.get(name, 0) + 1
+            self.current.peak_live[name] = max(self.current.peak_live.get(name, 0), self.live[name])
+    def release(self, obj):
+        self.live[type(obj).__name__] -= 1
+    def install(self):
+        # count the instances that already exist, so that their release
+        # during evaluation keeps the live counts right
+        for obj in gc.get_objects():
+            if type(obj) in COUNTED_CLASSES:
+                name = type(obj).__name__
+                self.live[name] = self.live.get(name, 0) + 1
+        for cls in COUNTED_CLASSES:
+            original = cls.__dict__['__init__']
+            self.originals[cls] = original
+            cls.__init__ = self.counting_init(cls, original)
+            cls.__del__ = self.counting_del(cls)
+    def uninstall(self):
+        for cls, original in self.originals.items():
+            cls.__init__ = original
+            del cls.__del__
+        self.originals = {}
+    def counting_init(self, cls, original):
+        def __init__(obj, *args, **kwargs):
+            original(obj, *args, **kwargs)
+            if type(obj) is cls:
+                self.record(obj)
+        return __init__
+    def counting_del(self, cls):
+        def __del__(obj):
+            if type(obj) is cls:
+                self.release(obj)
+        return __del__
+    def start_link(self, source, line, column):
+        self.current = LinkStats(source, line, column)
+        for name, n in self.live.items():
+            self.current.peak_live[name] = n
+        self.links.append(self.current)
+        # only trace what this link allocates, so that the snapshot at its end
+        # stays small however much earlier links have retained
+        tracemalloc.clear_traces()
+    def end_link(self):
+        peak = tracemalloc.get_traced_memory()[1]
+        sizes = file_bytes(tracemalloc.take_snapshot())
+        # the peak is process-wide, so take out what the instrumentation
+        # itself allocated during the link
+        self.current.peak_bytes = max(0, peak - traced_bytes(sizes, TOOL_FILES))
+        self.current.bytes = traced_bytes(sizes, INTERPRETER_FILES)
+        self.current = None
+    def totals(self):
+        totals = {}
+        for link in self.links:
+            for name, n in link.allocations.items():
+                totals[name] = totals.get(name, 0) + n
+        return totals
+    def to_dict(self):
+        return {
+            'links': [link.to_dict() for link in self.links],
+            'allocations': self.totals(),
+            'live': {name: n for name, n in self.live.items() if n}
+        }
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
+    def __str__(self):
+        return '\n'.join(map(str, self.links))
+
+def evaluate(source, init_value=None, scope=None):
+    links = parse.parse_links(source)
+    stats = MemStats()
+    if not links:
+        return None, stats
+    def evaluate_link(i, link, inputs, scope):
+        start = links[i].start
+        line = source.count('\n', 0, start) + 1
+        column = start - source.rfind('\n', 0, start)
+        stats.start_link(source[start:links[i].end], line, column)
+        value = logic.evaluate_link(i, link, inputs, scope)
+        stats.end_link()
+        return value
+    chain = logic.Chain([link.expr for link in links])
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    stats.install()
+    try:
+        result = chain.evaluate_from(0, init_value or logic.HNONE,
+            scope or logic.Scope(helter_builtins.BUILTINS), evaluate_link=evaluate_link)
+        return result, stats
+    finally:
+        stats.uninstall()
+        if not tracing:
+            tracemalloc.stop()
@@ -137,4 +137,20 @@ def parse_expr(t):
     return None
 
 def parse(s):
-    return parse_expr(Tracker(s))
\ No newline at end of file
+    return parse_expr(Tracker(s))
+class LinkSpan:
+    def __init__(self, start, end, expr):
+        self.start = start
+        self.end = end
+        self.expr = expr
+
+def parse_links(s, pos=0):
+    t = Tracker(s, pos)
+    links = []
+    while True:
+        parse_re(SPACES, t)
+        start = t.pos
+        e = parse_expr_not_chain(t)
+        if not e:
+            return links
+        links.append(LinkSpan(start, t.pos, e))